@@ -1,15 +1,26 @@
 #!/usr/bin/env -S uv run
 import argparse
+import asyncio
 import csv
 import datetime
+import math
+import os
 import pathlib
 import re
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
 import langdetect
+import numpy as np
 import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import pytesseract
 from googletrans import Translator
 from rich.console import Console
@@ -21,6 +32,24 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
+try:
+    from tesserocr import PSM, PyTessBaseAPI
+
+    HAS_TESSEROCR = True
+except ImportError:
+    HAS_TESSEROCR = False
+
+try:
+    import fasttext
+
+    HAS_FASTTEXT = True
+except ImportError:
+    HAS_FASTTEXT = False
+
+# fastText language identification model, downloaded from
+# https://fasttext.cc/docs/en/language-identification.html
+LID_MODEL_PATH = pathlib.Path(__file__).parent / "lid.176.ftz"
+
 console = Console()
 
 
@@ -32,34 +61,37 @@ class TitleExtractionResult:
     score: float
     explanation: str
     original_text_sample: str = ""
+    # Rendered first page on disk, set while the PDF waits for the batched OCR pass
+    ocr_image_path: Optional[pathlib.Path] = None
+
+
+# Common non-title patterns, combined into a single regex compiled once
+SKIP_PATTERNS = [
+    r'^page\s+\d+',
+    r'^\d+$',
+    r'^\d+\s*of\s*\d+',
+    r'^chapter\s+\d+',
+    r'^section\s+\d+',
+    r'^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # dates
+    r'^[a-z]+@[a-z]+\.[a-z]+',  # emails
+    r'^https?://',  # URLs
+    r'^www\.',
+    r'^abstract$',
+    r'^introduction$',
+    r'^conclusion$',
+    r'^references$',
+    r'^bibliography$'
+]
+SKIP_RE = re.compile("|".join(f"(?:{pattern})" for pattern in SKIP_PATTERNS))
 
 
 def is_likely_title(text: str) -> bool:
     """Checks if text looks like a document title."""
-    # Skip common non-title patterns
-    skip_patterns = [
-        r'^page\s+\d+',
-        r'^\d+$',
-        r'^\d+\s*of\s*\d+',
-        r'^chapter\s+\d+',
-        r'^section\s+\d+',
-        r'^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # dates
-        r'^[a-z]+@[a-z]+\.[a-z]+',  # emails
-        r'^https?://',  # URLs
-        r'^www\.',
-        r'^abstract$',
-        r'^introduction$',
-        r'^conclusion$',
-        r'^references$',
-        r'^bibliography$'
-    ]
-    
     text_lower = text.lower().strip()
     
     # Skip if matches any skip pattern
-    for pattern in skip_patterns:
-        if re.search(pattern, text_lower):
-            return False
+    if SKIP_RE.search(text_lower):
+        return False
     
     # Prefer longer titles (3+ words)
     word_count = len(text.split())
@@ -71,51 +103,71 @@ def is_likely_title(text: str) -> bool:
         return False
         
     # Skip texts that are mostly numbers or special characters
-    alpha_ratio = sum(c.isalpha() for c in text) / len(text)
+    alpha_ratio = sum(map(str.isalpha, text)) / len(text)
     if alpha_ratio < 0.5:
         return False
         
     return True
 
 
-def extract_title_from_chars(page) -> TitleExtractionResult:
+def read_first_page_chars(file_path: pathlib.Path) -> list[dict]:
+    """Reads first-page chars via pdfium, shaped like pdfplumber's ``page.chars``.
+
+    Much faster than pdfplumber, which goes through pdfminer.six. Only the
+    keys used by font analysis are filled in: text, size, x0 and y0.
+    """
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        textpage = pdf[0].get_textpage()
+        matrix = pdfium_c.FS_MATRIX()
+        chars = []
+        for i in range(textpage.count_chars()):
+            # Skip spaces/line breaks pdfium infers; pdfplumber doesn't have them
+            if pdfium_c.FPDFText_IsGenerated(textpage.raw, i):
+                continue
+            pdfium_c.FPDFText_GetMatrix(textpage.raw, i, matrix)
+            x0, y0, _, _ = textpage.get_charbox(i, loose=True)
+            chars.append({
+                'text': chr(pdfium_c.FPDFText_GetUnicode(textpage.raw, i)),
+                'size': pdfium_c.FPDFText_GetFontSize(textpage.raw, i) * math.hypot(matrix.c, matrix.d),
+                'x0': x0,
+                'y0': y0,
+            })
+        return chars
+    finally:
+        pdf.close()
+
+
+def extract_title_from_chars(chars: list[dict]) -> TitleExtractionResult:
     """Extract title using font size and positioning analysis."""
     try:
-        chars = page.chars
         if not chars:
             return None
             
-        # Group chars by font size and get the largest
-        font_sizes = {}
-        for char in chars:
-            size = char.get('size', 0)
-            if size > 0:
-                if size not in font_sizes:
-                    font_sizes[size] = []
-                font_sizes[size].append(char)
+        # Lay the char attributes out as arrays so grouping and sorting run
+        # in NumPy instead of per-char Python loops
+        n = len(chars)
+        sizes = np.fromiter((c.get('size', 0) for c in chars), dtype=np.float64, count=n)
+        ys = np.round(np.fromiter((c.get('y0', 0) for c in chars), dtype=np.float64, count=n), 1)
+        xs = np.fromiter((c.get('x0', 0) for c in chars), dtype=np.float64, count=n)
+        texts = np.array([c.get('text', '') for c in chars], dtype=object)
         
-        if not font_sizes:
+        positive_sizes = sizes[sizes > 0]
+        if not positive_sizes.size:
             return None
             
-        # Sort by font size (descending)
-        sorted_sizes = sorted(font_sizes.keys(), reverse=True)
-        
         # Try largest font sizes first
-        for size in sorted_sizes[:3]:  # Check top 3 font sizes
-            chars_with_size = font_sizes[size]
+        for size in np.unique(positive_sizes)[::-1][:3]:  # Check top 3 font sizes
+            size = float(size)
+            indices = np.flatnonzero(sizes == size)
             
-            # Group chars into lines/words
-            lines = {}
-            for char in chars_with_size:
-                y = round(char.get('y0', 0), 1)
-                if y not in lines:
-                    lines[y] = []
-                lines[y].append(char)
+            # Order chars top to bottom, then left to right within a line
+            ordered = indices[np.lexsort((xs[indices], -ys[indices]))]
+            line_breaks = np.flatnonzero(np.diff(ys[ordered])) + 1
             
             # Build text from each line
-            for y_pos in sorted(lines.keys(), reverse=True):  # Top to bottom
-                line_chars = sorted(lines[y_pos], key=lambda c: c.get('x0', 0))
-                text = ''.join(c.get('text', '') for c in line_chars).strip()
+            for line in np.split(ordered, line_breaks):
+                text = ''.join(texts[line].tolist()).strip()
                 
                 if text and is_likely_title(text):
                     score = min(0.9, 0.7 + (size / 20.0))  # Higher score for larger fonts
@@ -150,7 +202,7 @@ def extract_title_from_positioned_text(page) -> TitleExtractionResult:
         page_height = page.height
         
         # Extract text with bounding boxes
-        words = page.extract_words()
+        words = page.extract_words(keep_blank_chars=False, use_text_flow=False)
         if not words:
             return None
             
@@ -171,7 +223,7 @@ def extract_title_from_positioned_text(page) -> TitleExtractionResult:
             
         # Process each line from top to bottom
         for y_pos in sorted(lines.keys(), reverse=True):
-            line_words = sorted(lines[y_pos], key=lambda w: w['x0'])
+            line_words = sorted(lines[y_pos], key=itemgetter('x0'))
             text = ' '.join(w['text'] for w in line_words).strip()
             
             if text and is_likely_title(text):
@@ -196,7 +248,7 @@ def extract_title_from_positioned_text(page) -> TitleExtractionResult:
                     
         # If no centered text found, return first good title from top
         for y_pos in sorted(lines.keys(), reverse=True):
-            line_words = sorted(lines[y_pos], key=lambda w: w['x0'])
+            line_words = sorted(lines[y_pos], key=itemgetter('x0'))
             text = ' '.join(w['text'] for w in line_words).strip()
             
             if text and is_likely_title(text):
@@ -263,29 +315,36 @@ def extract_title_fallback(text: str) -> TitleExtractionResult:
     )
 
 
-def extract_title(page, text: str) -> TitleExtractionResult:
-    """Main title extraction function using multiple methods."""
+def extract_title(page, log: list[str], skip_font_analysis: bool = False) -> TitleExtractionResult:
+    """Main title extraction function using multiple methods.
+
+    Full-page text extraction is the slowest step in pdfplumber, so it only
+    runs when the char- and word-based methods both fail. Font analysis is
+    skipped when the pdfium fast path has already run it without success.
+    """
     results = []
     
     # Method 1: Font size analysis
-    result1 = extract_title_from_chars(page)
-    results.append(result1)
-    if result1.title:
-        console.print(f"[dim]Found title via font analysis:[/dim] '{result1.title}' (score: {result1.score:.2f})")
-        return result1
+    if not skip_font_analysis:
+        result1 = extract_title_from_chars(page.chars)
+        results.append(result1)
+        if result1.title:
+            log.append(f"[dim]Found title via font analysis:[/dim] '{result1.title}' (score: {result1.score:.2f})")
+            return result1
         
     # Method 2: Position analysis
     result2 = extract_title_from_positioned_text(page)
     results.append(result2)
     if result2.title:
-        console.print(f"[dim]Found title via position analysis:[/dim] '{result2.title}' (score: {result2.score:.2f})")
+        log.append(f"[dim]Found title via position analysis:[/dim] '{result2.title}' (score: {result2.score:.2f})")
         return result2
         
     # Method 3: Improved first-line fallback
+    text = page.extract_text(x_tolerance=2, y_tolerance=2, use_text_flow=False)
     result3 = extract_title_fallback(text)
     results.append(result3)
     if result3.title:
-        console.print(f"[dim]Found title via fallback method:[/dim] '{result3.title}' (score: {result3.score:.2f})")
+        log.append(f"[dim]Found title via fallback method:[/dim] '{result3.title}' (score: {result3.score:.2f})")
         return result3
         
     # Return the result with the highest score, even if title is None
@@ -293,65 +352,175 @@ def extract_title(page, text: str) -> TitleExtractionResult:
     return best_result
 
 
+# Deletes every ASCII char that is neither alphanumeric nor whitespace
+FILENAME_DELETE_TABLE = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if not (c.isalnum() or c.isspace()))
+)
+
+
 def format_filename(text: str) -> str:
     """Formats text into 'underline_format'."""
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", "", text).strip()
-    text = re.sub(r"\s+", " ", text).replace(" ", "_")
-    return f"{text}.pdf"
+    # Collapse Unicode whitespace to single spaces before dropping non-ASCII,
+    # so it still separates words
+    text = " ".join(text.lower().split()).encode("ascii", "ignore").decode("ascii")
+    return "_".join(text.translate(FILENAME_DELETE_TABLE).split()) + ".pdf"
 
 
-def process_pdf(file_path: pathlib.Path) -> tuple[Optional[str], TitleExtractionResult]:
-    """Extracts title, translates, and formats a new name."""
-    console.print(f"[blue]Processing:[/blue] {file_path.name}")
-    
-    # Method 1: Use pdfplumber to extract text
+@lru_cache(maxsize=1)
+def load_lid_model():
+    """Loads the fastText language model once per process, or None if unavailable."""
+    if not HAS_FASTTEXT or not LID_MODEL_PATH.exists():
+        return None
+    return fasttext.load_model(str(LID_MODEL_PATH))
+
+
+@lru_cache(maxsize=4096)
+def detect_language(text: str) -> str:
+    """Detects the language of a title, cached since repeated titles are common.
+
+    Uses fastText's compiled model when it is installed and downloaded, which
+    is much faster than langdetect's pure-Python scoring.
+    """
+    lid_model = load_lid_model()
+    if lid_model is None:
+        return langdetect.detect(text)
+    # The list form of predict avoids a NumPy 2 incompatibility in fastText
+    labels, _ = lid_model.predict([text.replace("\n", " ")], k=1)
+    return labels[0][0].removeprefix("__label__")
+
+
+@lru_cache(maxsize=1)
+def load_tess_api():
+    """Creates the tesserocr API once per process, loading the language data a single time."""
+    return PyTessBaseAPI(lang="eng+heb", psm=PSM.SINGLE_BLOCK)
+
+
+def extract_title_with_pdfplumber(file_path: pathlib.Path, log: list[str], ocr_dir: pathlib.Path, skip_font_analysis: bool = False) -> TitleExtractionResult:
+    """Runs the full pdfplumber pipeline, falling back to OCR when the page has no text."""
     with pdfplumber.open(file_path) as pdf:
         first_page = pdf.pages[0]
-        text = first_page.extract_text(x_tolerance=2, y_tolerance=2)
         
-        if not text or len(text) < 10:
-            # Method 2: If text extraction fails, use OCR on the first page
-            console.print(f"[yellow]No text found in {file_path.name}, attempting OCR...[/yellow]")
+        if len(first_page.chars) < 10:
+            # No usable text layer. With tesserocr the rendered page is OCRed
+            # right here in the worker; otherwise it is written to disk for
+            # the batched tesseract CLI pass run by the parent. PGM skips the
+            # PNG encode/decode cost
             try:
-                page_image = first_page.to_image(resolution=300)
-                image_path = file_path.parent / "temp_ocr_image.png"
-                page_image.save(image_path)
-                text = pytesseract.image_to_string(str(image_path), lang="eng+heb")
-                pathlib.Path(image_path).unlink()
+                image = first_page.to_image(resolution=200).original.convert("L")
+                if HAS_TESSEROCR:
+                    log.append(f"[yellow]No text found in {file_path.name}, running OCR...[/yellow]")
+                    api = load_tess_api()
+                    api.SetImage(image)
+                    text = api.GetUTF8Text()
+                else:
+                    log.append(f"[yellow]No text found in {file_path.name}, queueing for OCR...[/yellow]")
+                    image_path = ocr_dir / f"{file_path.name}.pgm"
+                    image.save(image_path)
             except Exception as e:
-                console.print(f"[bold red]OCR failed for {file_path.name}:[/bold red] {e}")
-                return None, TitleExtractionResult(
+                log.append(f"[bold red]OCR failed for {file_path.name}:[/bold red] {e}")
+                return TitleExtractionResult(
                     title=None,
                     method="ocr_failed",
                     score=0.0,
                     explanation=f"OCR failed: {str(e)}"
                 )
+            if HAS_TESSEROCR:
+                title_result = extract_title_fallback(text)
+                if title_result.title:
+                    log.append(f"[dim]Found title via OCR fallback method:[/dim] '{title_result.title}' (score: {title_result.score:.2f})")
+                return title_result
+            return TitleExtractionResult(
+                title=None,
+                method="ocr_pending",
+                score=0.0,
+                explanation="Queued for OCR",
+                ocr_image_path=image_path
+            )
 
-    title_result = extract_title(first_page, text)
+        return extract_title(first_page, log, skip_font_analysis)
+
+
+def ocr_images(image_paths: list[pathlib.Path]) -> list[tuple[str, Optional[str]]]:
+    """OCRs all images in one tesseract CLI run, loading the language data only once.
+
+    Used when tesserocr is not installed. The CLI reads an image-list file
+    and separates each image's output with a form feed. If the batch run
+    fails, the images are retried one at a time, so a bad image only fails
+    itself. Returns a (text, error) pair per image.
+    """
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            list_file = pathlib.Path(tmp_dir) / "images.txt"
+            list_file.write_text("\n".join(str(p) for p in image_paths) + "\n", encoding="utf-8")
+            text = pytesseract.image_to_string(str(list_file), lang="eng+heb", config="--psm 6")
+    except Exception:
+        results = []
+        for image_path in image_paths:
+            try:
+                results.append((pytesseract.image_to_string(str(image_path), lang="eng+heb", config="--psm 6"), None))
+            except Exception as e:
+                results.append(("", str(e)))
+        return results
+    pages = text.split("\x0c")
+    pages = pages[:len(image_paths)] + [""] * (len(image_paths) - len(pages))
+    return [(page, None) for page in pages]
+
+
+def process_pdf(file_path: pathlib.Path, ocr_dir: pathlib.Path) -> tuple[TitleExtractionResult, Optional[str], list[str]]:
+    """Extracts the title and detects its language.
+
+    Runs inside a worker process, so console output is collected into a list
+    of rich markup lines and returned for the parent to print. Translation is
+    left to the parent so all Hebrew titles go out in one batch.
+    """
+    log = [f"[blue]Processing:[/blue] {file_path.name}"]
+    
+    # Fast path: font analysis on chars read through pdfium
+    try:
+        title_result = extract_title_from_chars(read_first_page_chars(file_path))
+    except Exception:
+        title_result = None
+        
+    if title_result and title_result.title:
+        log.append(f"[dim]Found title via font analysis:[/dim] '{title_result.title}' (score: {title_result.score:.2f})")
+    else:
+        # Fall back to pdfplumber for position analysis, plain text and OCR.
+        # A result without a title means font analysis already ran and failed
+        title_result = extract_title_with_pdfplumber(
+            file_path, log, ocr_dir, skip_font_analysis=title_result is not None
+        )
+        
     if not title_result.title:
-        console.print(f"[yellow]Could not extract a title from {file_path.name}.[/yellow]")
-        return None, title_result
+        if title_result.method != "ocr_pending":
+            log.append(f"[yellow]Could not extract a title from {file_path.name}.[/yellow]")
+        return title_result, None, log
         
     title = title_result.title
 
-    # Method 3: Check language and translate if needed
+    # Method 3: Check language; Hebrew titles are translated later in one batch
     try:
-        detected_lang = langdetect.detect(title)
-        if detected_lang == "he":
-            console.print(f"[cyan]Translating Hebrew title from {file_path.name}:[/cyan] '{title}'")
-            translator = Translator()
-            translated_title = translator.translate(title, dest="en").text
-            console.print(f"[cyan]Translated to:[/cyan] '{translated_title}'")
-            title_result.explanation += f" | Translated from Hebrew"
-            return format_filename(translated_title), title_result
-        else:
-            console.print(f"[magenta]Using English title from {file_path.name}:[/magenta] '{title}'")
-            return format_filename(title), title_result
+        detected_lang = detect_language(title)
     except Exception as e:
-        console.print(f"[bold red]Translation/Language detection failed for {file_path.name}:[/bold red] {e}")
-        title_result.explanation += f" | Translation failed: {str(e)}"
-        return format_filename(title), title_result
+        log.append(f"[bold red]Language detection failed for {file_path.name}:[/bold red] {e}")
+        title_result.explanation += f" | Language detection failed: {str(e)}"
+        return title_result, None, log
+
+    if detected_lang != "he":
+        log.append(f"[magenta]Using English title from {file_path.name}:[/magenta] '{title}'")
+    return title_result, detected_lang, log
+
+
+async def _translate_batch(titles: list[str]) -> list[str]:
+    async with Translator() as translator:
+        translations = await translator.translate(titles, dest="en")
+    return [t.text for t in translations]
+
+
+def translate_titles(titles: list[str]) -> list[str]:
+    """Translates titles to English in a single batched request."""
+    if not titles:
+        return []
+    return asyncio.run(_translate_batch(titles))
 
 
 def copy_and_rename_file(old_path: pathlib.Path, new_name: str, output_path: pathlib.Path) -> None:
@@ -361,19 +530,59 @@ def copy_and_rename_file(old_path: pathlib.Path, new_name: str, output_path: pat
     shutil.copy2(old_path, new_path)
 
 
-def write_processing_log(log_entries: list, output_path: pathlib.Path):
-    """Write processing log to CSV file."""
-    log_file = output_path / f"pdf_rename_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    
-    with open(log_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['original_name', 'transformed_name', 'score', 'method', 'explanation', 'status', 'original_text_sample']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for entry in log_entries:
-            writer.writerow(entry)
+def finish_pdf(index: int, file_path: pathlib.Path, title_result: TitleExtractionResult, title: Optional[str],
+               output_path: pathlib.Path, processing_log: "ProcessingLogWriter", renamed_by: dict[str, int]) -> bool:
+    """Logs one PDF's outcome and copies it under its new name; returns True if renamed.
+
+    When two PDFs get the same name the later one in sorted order wins, as
+    in a serial run, even if the earlier one is only finished after OCR or
+    translation.
+    """
+    new_name = format_filename(title) if title else None
+    log_entry = {
+        'original_name': file_path.name,
+        'transformed_name': new_name or "SKIPPED",
+        'score': title_result.score,
+        'method': title_result.method,
+        'explanation': title_result.explanation,
+        'original_text_sample': title_result.original_text_sample,
+        'status': 'success' if new_name else 'skipped'
+    }
+    processing_log.write(log_entry)
     
-    console.print(f"[bold blue]Log saved to:[/bold blue] {log_file}")
+    if not new_name:
+        console.print(f"[yellow]Skipped:[/yellow] Could not find a suitable title for '{file_path.name}'.")
+        return False
+    if renamed_by.get(new_name, -1) > index:
+        console.print(f"[yellow]Not copying[/yellow] '{file_path.name}': '{new_name}' is already taken by a later file")
+    else:
+        copy_and_rename_file(file_path, new_name, output_path)
+        renamed_by[new_name] = index
+    return True
+
+
+class ProcessingLogWriter:
+    """Streams processing log rows to a CSV file as each PDF is handled."""
+
+    fieldnames = ['original_name', 'transformed_name', 'score', 'method', 'explanation', 'status', 'original_text_sample']
+
+    def __init__(self, output_path: pathlib.Path):
+        self.log_file = output_path / f"pdf_rename_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    def __enter__(self) -> "ProcessingLogWriter":
+        self._csvfile = open(self.log_file, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._csvfile, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+        return self
+
+    def write(self, entry: dict) -> None:
+        """Write one log row, flushed so a crash keeps everything logged so far."""
+        self._writer.writerow(entry)
+        self._csvfile.flush()
+
+    def __exit__(self, *exc_info) -> None:
+        self._csvfile.close()
+        console.print(f"[bold blue]Log saved to:[/bold blue] {self.log_file}")
 
 
 def main():
@@ -382,6 +591,8 @@ def main():
     parser.add_argument("output_dir", help="Output directory for renamed PDF files")
     parser.add_argument("--num_files", type=int, default=5, 
                        help="Number of files to process (default: 5, -1 for all)")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 6),
+                       help="Number of parallel worker processes (default: min(cpu_count, 6))")
     
     args = parser.parse_args()
     
@@ -419,51 +630,119 @@ def main():
         TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
         TimeRemainingColumn(),
         console=console,
-    ) as progress:
+    ) as progress, ProcessingLogWriter(output_path) as processing_log, tempfile.TemporaryDirectory() as ocr_tmp_dir:
+        # Pages without a text layer are rendered here by the workers and
+        # OCRed together in pass 2
+        ocr_dir = pathlib.Path(ocr_tmp_dir)
         task = progress.add_task("[green]Processing files...", total=len(pdf_files))
         
         processed = 0
         skipped = 0
-        log_entries = []
+        # new file name -> index of the PDF copied under it
+        renamed_by = {}
+        ocr_pending = []
+        hebrew = []
         
-        for file_path in pdf_files:
-            try:
-                new_name, title_result = process_pdf(file_path)
-                log_entry = {
-                    'original_name': file_path.name,
-                    'transformed_name': new_name or "SKIPPED",
-                    'score': title_result.score,
-                    'method': title_result.method,
-                    'explanation': title_result.explanation,
-                    'original_text_sample': title_result.original_text_sample,
-                    'status': 'success' if new_name else 'skipped'
-                }
-                log_entries.append(log_entry)
+        # Pass 1: extract titles in parallel. Files that need neither OCR nor
+        # translation are logged and copied right away; only the others are
+        # kept for the later passes
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = deque(
+                (index, file_path, executor.submit(process_pdf, file_path, ocr_dir))
+                for index, file_path in enumerate(pdf_files)
+            )
+
+            # Results are taken in pdf_files order, not completion order, so
+            # the log order doesn't depend on worker timing. popleft drops
+            # each finished result
+            while futures:
+                index, file_path, future = futures.popleft()
+                try:
+                    title_result, detected_lang, worker_log = future.result()
+                    for line in worker_log:
+                        console.print(line)
+                except Exception as e:
+                    console.print(f"[bold red]Error processing {file_path.name}:[/bold red] {e}")
+                    log_entry = {
+                        'original_name': file_path.name,
+                        'transformed_name': "ERROR",
+                        'score': 0.0,
+                        'method': 'error',
+                        'explanation': str(e),
+                        'original_text_sample': '',
+                        'status': 'error'
+                    }
+                    processing_log.write(log_entry)
+                    skipped += 1
+                else:
+                    if title_result.method == "ocr_pending":
+                        ocr_pending.append((index, file_path, title_result))
+                    elif detected_lang == "he":
+                        hebrew.append((index, file_path, title_result))
+                    elif finish_pdf(index, file_path, title_result, title_result.title, output_path, processing_log, renamed_by):
+                        processed += 1
+                    else:
+                        skipped += 1
+        
+                progress.advance(task)
+
+        # Pass 2: without tesserocr, OCR every page without a text layer in
+        # one tesseract CLI run
+        if ocr_pending:
+            console.print(f"[yellow]Running OCR on {len(ocr_pending)} files...[/yellow]")
+            ocr_results = ocr_images([title_result.ocr_image_path for _, _, title_result in ocr_pending])
+        
+            for (index, file_path, _), (text, ocr_error) in zip(ocr_pending, ocr_results):
+                detected_lang = None
+                if ocr_error:
+                    console.print(f"[bold red]OCR failed for {file_path.name}:[/bold red] {ocr_error}")
+                    title_result = TitleExtractionResult(
+                        title=None,
+                        method="ocr_failed",
+                        score=0.0,
+                        explanation=f"OCR failed: {ocr_error}"
+                    )
+                else:
+                    title_result = extract_title_fallback(text)
+                
+                if title_result.title:
+                    console.print(f"[dim]Found title via OCR fallback method:[/dim] '{title_result.title}' (score: {title_result.score:.2f})")
+                    try:
+                        detected_lang = detect_language(title_result.title)
+                    except Exception as e:
+                        console.print(f"[bold red]Language detection failed for {file_path.name}:[/bold red] {e}")
+                        title_result.explanation += f" | Language detection failed: {str(e)}"
+                else:
+                    console.print(f"[yellow]Could not extract a title from {file_path.name}.[/yellow]")
                 
-                if new_name:
-                    copy_and_rename_file(file_path, new_name, output_path)
+                if detected_lang == "he":
+                    hebrew.append((index, file_path, title_result))
+                elif finish_pdf(index, file_path, title_result, title_result.title, output_path, processing_log, renamed_by):
                     processed += 1
                 else:
-                    console.print(f"[yellow]Skipped:[/yellow] Could not find a suitable title for '{file_path.name}'.")
                     skipped += 1
+            ocr_pending.clear()
+
+        # Pass 3: translate all Hebrew titles in one request
+        if hebrew:
+            hebrew.sort(key=itemgetter(0))
+            console.print(f"[cyan]Translating {len(hebrew)} Hebrew titles...[/cyan]")
+            try:
+                translations = translate_titles([title_result.title for _, _, title_result in hebrew])
+                for (_, _, title_result), translated_title in zip(hebrew, translations):
+                    console.print(f"[cyan]Translated[/cyan] '{title_result.title}' -> '{translated_title}'")
+                    title_result.explanation += f" | Translated from Hebrew"
             except Exception as e:
-                console.print(f"[bold red]Error processing {file_path.name}:[/bold red] {e}")
-                log_entry = {
-                    'original_name': file_path.name,
-                    'transformed_name': "ERROR",
-                    'score': 0.0,
-                    'method': 'error',
-                    'explanation': str(e),
-                    'original_text_sample': '',
-                    'status': 'error'
-                }
-                log_entries.append(log_entry)
-                skipped += 1
+                console.print(f"[bold red]Translation failed:[/bold red] {e}")
+                translations = [title_result.title for _, _, title_result in hebrew]
+                for _, _, title_result in hebrew:
+                    title_result.explanation += f" | Translation failed: {str(e)}"
             
-            progress.advance(task)
-            
-        # Write processing log
-        write_processing_log(log_entries, output_path)
+            for (index, file_path, title_result), title in zip(hebrew, translations):
+                if finish_pdf(index, file_path, title_result, title, output_path, processing_log, renamed_by):
+                    processed += 1
+                else:
+                    skipped += 1
     
     console.print(f"[bold green]Processing complete![/bold green] Processed: {processed}, Skipped: {skipped}")
     console.print(f"[bold]Renamed PDFs saved to:[/bold] {output_path}")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 from dynaconf import Dynaconf
@@ -7,11 +8,12 @@ from langchain_ollama import OllamaEmbeddings
 settings = Dynaconf(settings_files=[Path(__file__).parent / "settings.toml"])
 
 
+@lru_cache(maxsize=1)
 def get_embedding_function():
-    """embeddings = BedrockEmbeddings(
-        credentials_profile_name="default", region_name="us-east-1"
-    )
-    """
+    """Shared OllamaEmbeddings client, cached so callers reuse one connection pool."""
+    # embeddings = BedrockEmbeddings(
+    #     credentials_profile_name="default", region_name="us-east-1"
+    # )
     model_name = settings.get('embedding.model', 'toshk0/nomic-embed-text-v2-moe:Q6_K')
     embeddings = OllamaEmbeddings(model=model_name)
     # embeddings = OllamaEmbeddings(model="mxbai-embed-large")
@@ -1,15 +1,28 @@
 import argparse
+import hashlib
+import itertools
+import os
+import pickle
 import shutil
+import time
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Set, Tuple
 
 from dynaconf import Dynaconf
 from langchain.schema.document import Document
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+import numpy as np
+import pypdfium2 as pdfium
 from tqdm import tqdm
 
 try:
@@ -28,6 +41,13 @@ except ImportError:
     DEVICE = None
     print("💻 Using CPU processing (PyTorch not available)")
 
+try:
+    from semantic_text_splitter import TextSplitter
+
+    HAS_RUST_SPLITTER = True
+except ImportError:
+    HAS_RUST_SPLITTER = False
+
 from embedding import get_embedding_function
 
 # Load settings
@@ -37,123 +57,269 @@ settings = Dynaconf(settings_files=[Path(__file__).parent / "settings.toml"])
 project_root = Path.cwd()
 DATA_PATH = project_root / settings.pdf_processing.input_folder
 CHROMA_PATH = settings.pdf_processing.chroma_path
+# IDs ingested so far, kept next to the Chroma files to skip a full DB scan
+ID_CACHE_PATH = Path(CHROMA_PATH) / ".ids.pkl"
+ID_LOOKUP_BATCH_SIZE = 5000
+# Embeddings of chunk texts seen before, keyed by a hash of the text. Kept
+# outside CHROMA_PATH so a --reset reload doesn't re-embed unchanged text
+EMBEDDING_CACHE_PATH = Path(
+    settings.get("embedding.cache_path", "data/embedding_cache")
+)
+# Shards past which the smaller ones are merged, and rows copied per merge step
+EMBEDDING_CACHE_MAX_SHARDS = 8
+EMBEDDING_CACHE_MERGE_BLOCK = 8192
+# Seconds between progress bar redraws
+PROGRESS_MIN_INTERVAL = 0.5
 
 # Apple Silicon optimized settings
 BATCH_SIZE = settings.get("performance.batch_size", 400)
 MAX_WORKERS = settings.get("performance.max_workers", min(mp.cpu_count(), 8))
+# PDFs queued to the loader pool at once
+MAX_IN_FLIGHT_FILES = 2 * MAX_WORKERS
+EMBED_WORKERS = settings.get("performance.embed_workers", 4)
+EMBED_BATCH_SIZE = settings.get("performance.embed_batch_size", 64)
 USE_MPS = (
     settings.get("performance.use_mps", True)
     and HAS_TORCH
     and torch.backends.mps.is_available()
 )
 
+# Built once at import so every split (and every worker process) reuses it
+TEXT_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=settings.text_splitter.chunk_size,
+    chunk_overlap=settings.text_splitter.chunk_overlap,
+    length_function=len,
+    is_separator_regex=settings.text_splitter.is_separator_regex,
+)
+USE_RUST_SPLITTER = (
+    settings.get("text_splitter.use_rust_splitter", False) and HAS_RUST_SPLITTER
+)
+RUST_SPLITTER = (
+    TextSplitter(
+        settings.text_splitter.chunk_size,
+        overlap=settings.text_splitter.chunk_overlap,
+    )
+    if USE_RUST_SPLITTER
+    else None
+)
+
 
 def load_single_pdf(pdf_path: Path) -> List[Document]:
-    """Load a single PDF file - optimized for multiprocessing"""
+    """Load a single PDF file with pdfium - optimized for multiprocessing"""
     try:
-        loader = PyPDFLoader(str(pdf_path))
-        documents = loader.load()
-        return documents
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            total_pages = len(pdf)
+            documents = []
+            for page_number in range(total_pages):
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+                documents.append(
+                    Document(
+                        page_content=text,
+                        metadata={
+                            "source": str(pdf_path),
+                            "page": page_number,
+                            "total_pages": total_pages,
+                        },
+                    )
+                )
+            return documents
+        finally:
+            pdf.close()
     except Exception as e:
         print(f"⚠️  Error loading {pdf_path.name}: {e}")
         return []
 
 
-def load_documents_parallel():
-    """Load documents using multiprocessing for Apple Silicon optimization"""
-    documents = []
+def split_pages(pages: List[Document]) -> List[Document]:
+    """Split the pages of one PDF into chunks that keep their page metadata"""
+    texts = [page.page_content for page in pages]
+    if USE_RUST_SPLITTER:
+        # Already inside a worker process, so split pages one by one rather
+        # than letting chunk_all start its own thread pool per file
+        page_chunks = [RUST_SPLITTER.chunks(text) for text in texts]
+    else:
+        page_chunks = [TEXT_SPLITTER.split_text(text) for text in texts]
+    return [
+        Document(page_content=text, metadata=page.metadata.copy())
+        for page, chunk_texts in zip(pages, page_chunks)
+        for text in chunk_texts
+    ]
+
+
+def load_and_split_pdf(pdf_path: Path) -> List[Document]:
+    """Load a PDF and split it in the same worker, so only chunks are sent back"""
+    return split_pages(load_single_pdf(pdf_path))
+
+
+def load_and_split_documents_parallel():
+    """Load and split documents using multiprocessing for Apple Silicon optimization"""
+    chunks = []
 
     # Verify data path exists
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Input folder not found: {DATA_PATH}")
 
-    # Get list of PDF files
-    pdf_files = [f for f in DATA_PATH.iterdir() if f.suffix.lower() == ".pdf"]
+    # Get list of PDF files, filtering on the cheap DirEntry name before
+    # building a Path for each match
+    with os.scandir(DATA_PATH) as entries:
+        pdf_files = sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        )
 
     if not pdf_files:
         print("⚠️  No PDF files found in the input folder")
-        return documents
+        return chunks
 
     print(f"📚 Found {len(pdf_files)} PDF files to process")
-    print(f"🔧 Using {MAX_WORKERS} processes for parallel loading")
-
-    # Process PDFs in parallel
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all PDF loading tasks
-        future_to_pdf = {
-            executor.submit(load_single_pdf, pdf_path): pdf_path
-            for pdf_path in pdf_files
-        }
-
-        # Collect results with progress bar
-        with tqdm(total=len(pdf_files), desc="Loading PDF files", unit="file") as pbar:
-            for future in as_completed(future_to_pdf):
-                pdf_path = future_to_pdf[future]
-                try:
-                    pdf_documents = future.result()
-                    documents.extend(pdf_documents)
-                    pbar.set_postfix({"Current": pdf_path.name})
-                except Exception as e:
-                    print(f"❌ Failed to process {pdf_path.name}: {e}")
-                pbar.update(1)
-
-    print(f"✅ Loaded {len(documents)} pages from {len(pdf_files)} PDF files")
-    return documents
-
-
-def split_documents_optimized(documents: List[Document]):
-    """Split documents with Apple Silicon memory optimization"""
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=settings.text_splitter.chunk_size,
-        chunk_overlap=settings.text_splitter.chunk_overlap,
-        length_function=len,
-        is_separator_regex=settings.text_splitter.is_separator_regex,
-    )
-
-    print(f"📄 Splitting {len(documents)} pages into chunks...")
-
-    # Process in batches to optimize memory usage on Apple Silicon
-    all_chunks = []
-    batch_size = BATCH_SIZE
+    print(f"🔧 Using {MAX_WORKERS} processes for loading and splitting")
+
+    # Each worker splits its PDF as soon as it is loaded, so full page texts
+    # never reach (or pile up in) the main process. At most
+    # MAX_IN_FLIGHT_FILES are queued at once, so memory held by pending tasks
+    # and finished-but-unread results stays flat however large the folder.
+    # Files finish in any order; each file's chunks stay together, which is
+    # all the chunk IDs depend on
+    pending_files = iter(pdf_files)
+    in_flight = {}
+    # Files that were in flight when a worker crashed are rerun one at a
+    # time, so only the file that actually crashes it is reported
+    retry_files = []
+    retried_files = set()
+    pool_broken = False
+    executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        with tqdm(
+            total=len(pdf_files),
+            desc="Loading PDF files",
+            unit="file",
+            mininterval=PROGRESS_MIN_INTERVAL,
+        ) as pbar:
+            while True:
+                if pool_broken and not in_flight:
+                    # A crashed worker (e.g. pdfium on a malformed PDF) takes
+                    # the whole pool down; go on with the rest in a new one
+                    executor.shutdown()
+                    executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+                    pool_broken = False
+                # submit() itself raises once a worker has died, even if
+                # wait() last returned a good result; the file never ran, so
+                # it goes back on the retry list
+                if retry_files and not (pool_broken or in_flight):
+                    pdf_path = retry_files.pop()
+                    try:
+                        in_flight[executor.submit(load_and_split_pdf, pdf_path)] = pdf_path
+                        retried_files.add(pdf_path)
+                    except BrokenProcessPool:
+                        pool_broken = True
+                        retry_files.append(pdf_path)
+                elif not (pool_broken or retry_files):
+                    for pdf_path in itertools.islice(
+                        pending_files, MAX_IN_FLIGHT_FILES - len(in_flight)
+                    ):
+                        try:
+                            in_flight[executor.submit(load_and_split_pdf, pdf_path)] = pdf_path
+                        except BrokenProcessPool:
+                            pool_broken = True
+                            retry_files.append(pdf_path)
+                            break
+                if not in_flight:
+                    if pool_broken or retry_files:
+                        continue
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path = in_flight.pop(future)
+                    try:
+                        chunks.extend(future.result())
+                    except BrokenProcessPool as e:
+                        pool_broken = True
+                        if pdf_path not in retried_files:
+                            retry_files.append(pdf_path)
+                            continue
+                        print(f"❌ Failed to process {pdf_path.name}: {e}")
+                    except Exception as e:
+                        print(f"❌ Failed to process {pdf_path.name}: {e}")
+                    # Left to the next timed redraw instead of forcing one
+                    pbar.set_postfix({"Current": pdf_path.name}, refresh=False)
+                    pbar.update(1)
+    finally:
+        executor.shutdown()
+
+    print(f"✅ Created {len(chunks)} text chunks from {len(pdf_files)} PDF files")
+    return chunks
 
-    with tqdm(total=len(documents), desc="Splitting documents", unit="page") as pbar:
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
-            batch_chunks = text_splitter.split_documents(batch)
-            all_chunks.extend(batch_chunks)
-            pbar.update(len(batch))
 
-    print(f"✅ Created {len(all_chunks)} text chunks")
-    return all_chunks
+def page_id(chunk: Document) -> str:
+    """Page identifier of a chunk: "source:page" """
+    metadata = chunk.metadata
+    return f"{metadata.get('source')}:{metadata.get('page')}"
 
 
 def calculate_chunk_ids_parallel(chunks):
     """Generate chunk IDs with optimized processing"""
-    last_page_id = None
-    current_chunk_index = 0
-
     print("🔗 Generating unique IDs for chunks...")
 
-    # Use tqdm for progress tracking
-    for chunk in tqdm(chunks, desc="Generating chunk IDs", unit="chunk"):
-        source = chunk.metadata.get("source")
-        page = chunk.metadata.get("page")
-        current_page_id = f"{source}:{page}"
+    # Chunks of a page are consecutive, so groupby buckets them per page and
+    # enumerate gives the index within the page: "source:page:index"
+    for current_page_id, page_chunks in itertools.groupby(chunks, key=page_id):
+        for chunk_index, chunk in enumerate(page_chunks):
+            chunk.metadata["id"] = f"{current_page_id}:{chunk_index}"
 
-        # If the page ID is the same as the last one, increment the index.
-        if current_page_id == last_page_id:
-            current_chunk_index += 1
-        else:
-            current_chunk_index = 0
+    return chunks
 
-        # Calculate the chunk ID.
-        chunk_id = f"{current_page_id}:{current_chunk_index}"
-        last_page_id = current_page_id
 
-        # Add it to the page meta-data.
-        chunk.metadata["id"] = chunk_id
+def embed_chunks(embedding_function, chunks: List[Document]) -> List[List[float]]:
+    """Embed the text of a batch of chunks in one request to Ollama"""
+    return embedding_function.embed_documents([chunk.page_content for chunk in chunks])
+
+
+def upsert_chunks(db: Chroma, chunks: List[Document], embeddings: np.ndarray):
+    """Write chunks with precomputed embeddings straight to the Chroma collection.
+
+    Passing the embeddings skips the re-embedding that Chroma.add_documents
+    would do.
+    """
+    db._collection.upsert(
+        ids=[chunk.metadata["id"] for chunk in chunks],
+        embeddings=embeddings,
+        documents=[chunk.page_content for chunk in chunks],
+        metadatas=[chunk.metadata for chunk in chunks],
+    )
 
-    return chunks
+
+def store_new_embeddings(
+    db: Chroma, model_name: str, chunks: List[Document], embeddings: List[List[float]]
+):
+    """Upsert freshly embedded chunks and save their vectors as a cache shard.
+
+    Saving per upsert keeps the vectors held in memory to one upsert's worth,
+    and an interrupted run keeps what it already embedded.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    upsert_chunks(db, chunks, vectors)
+    hashes = np.fromiter(
+        (content_hash(chunk.page_content) for chunk in chunks),
+        dtype=np.uint64,
+        count=len(chunks),
+    )
+    save_embedding_shard(model_name, hashes, vectors)
+
+
+def fetch_existing_ids(db: Chroma, ids: List[str]) -> Set[str]:
+    """Return which of the given IDs are already stored in the collection"""
+    existing_ids = set()
+    # Query in slices to stay under SQLite's bound-variable limit
+    for i in range(0, len(ids), ID_LOOKUP_BATCH_SIZE):
+        batch_ids = ids[i : i + ID_LOOKUP_BATCH_SIZE]
+        existing_ids.update(db._collection.get(ids=batch_ids, include=[])["ids"])
+    return existing_ids
 
 
 def add_to_db_optimized(chunks: List[Document]):
@@ -164,45 +330,304 @@ def add_to_db_optimized(chunks: List[Document]):
     )
     chunks_with_ids = calculate_chunk_ids_parallel(chunks)
 
-    # Add or Update the documents.
-    existing_items = db.get(include=[])
-    existing_ids = set(existing_items["ids"])
-    print(f"📊 Number of existing documents in DB: {len(existing_ids)}")
+    # Add or Update the documents. Only look up the IDs of these chunks that
+    # aren't already in the local cache. The cache is only a hint: when it is
+    # missing, or rows were added or removed behind its back so it no longer
+    # matches the collection size, it is rebuilt from the collection's IDs.
+    cached_ids = load_cached_ids()
+    if cached_ids is None or len(cached_ids) != db._collection.count():
+        if cached_ids is not None:
+            print("⚠️  ID cache is out of sync with the database - rebuilding it")
+        cached_ids = set(db._collection.get(include=[])["ids"])
+    unknown_ids = [
+        chunk.metadata["id"]
+        for chunk in chunks_with_ids
+        if chunk.metadata["id"] not in cached_ids
+    ]
+    existing_ids = cached_ids | fetch_existing_ids(db, unknown_ids)
+    print(
+        f"📊 Known document IDs: {len(cached_ids)} cached, "
+        f"{len(unknown_ids)} checked against the DB"
+    )
 
     # Only add documents that don't exist in the DB.
-    new_chunks = []
-    for chunk in tqdm(chunks_with_ids, desc="Checking for new chunks", unit="chunk"):
-        if chunk.metadata["id"] not in existing_ids:
-            new_chunks.append(chunk)
+    new_chunks = [
+        chunk for chunk in chunks_with_ids if chunk.metadata["id"] not in existing_ids
+    ]
 
     if len(new_chunks):
         print(f"👉 Adding {len(new_chunks)} new documents to database")
         new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]
 
+        # Reuse the embeddings of chunk texts embedded by earlier runs. Hits
+        # are kept as shard locations and read one upsert at a time
+        embedding_function = get_embedding_function()
+        shards = load_embedding_shards(embedding_function.model)
+        hashes = np.fromiter(
+            (content_hash(chunk.page_content) for chunk in new_chunks),
+            dtype=np.uint64,
+            count=len(new_chunks),
+        )
+        shard_of, row_of = lookup_cached_embeddings(shards, hashes)
+        cached = np.flatnonzero(shard_of >= 0)
+        chunks_to_embed = [new_chunks[i] for i in np.flatnonzero(shard_of < 0)]
+        if len(cached):
+            print(f"♻️  Reusing {len(cached)} cached embeddings")
+
         # Optimized batch processing for Apple Silicon
         memory_limit = settings.get('performance.memory_limit', 400)
-        optimal_batch_size = min(BATCH_SIZE, memory_limit)  # Limit for memory efficiency
-
-        if len(new_chunks) > optimal_batch_size:
+        optimal_batch_size = min(EMBED_BATCH_SIZE, BATCH_SIZE, memory_limit)  # Limit for memory efficiency
+        # Group similar-length chunks so each embed request pads to a
+        # similar sequence length; every chunk keeps its own ID, so the
+        # upsert needs no reordering afterwards
+        chunks_to_embed.sort(key=lambda chunk: len(chunk.page_content))
+        batches = [
+            chunks_to_embed[i : i + optimal_batch_size]
+            for i in range(0, len(chunks_to_embed), optimal_batch_size)
+        ]
+
+        if len(batches) > 1:
             print(
-                f"🔄 Processing in batches of {optimal_batch_size} for optimal performance"
+                f"🔄 Processing in batches of {optimal_batch_size} "
+                f"with {EMBED_WORKERS} requests in flight"
             )
+        if batches:
+            # Ollama loads the model on its first request; do that once here
+            # so the parallel batches below don't all queue up behind the load
+            embedding_function.embed_query("warmup")
+        # Writes are gathered into as few upserts (one SQLite transaction
+        # each) as the Chroma client accepts
+        max_upsert_size = db._client.get_max_batch_size()
+        # Embedding is an HTTP round trip to Ollama, so threads overlap the
+        # waits; the pool size caps the load on the local model server
+        with ThreadPoolExecutor(max_workers=EMBED_WORKERS) as executor:
+            futures = {
+                executor.submit(embed_chunks, embedding_function, batch): batch
+                for batch in batches
+            }
             with tqdm(
-                total=len(new_chunks), desc="Adding to database", unit="chunk"
+                total=len(new_chunks),
+                desc="Adding to database",
+                unit="chunk",
+                mininterval=PROGRESS_MIN_INTERVAL,
             ) as pbar:
-                for i in range(0, len(new_chunks), optimal_batch_size):
-                    batch_chunks = new_chunks[i : i + optimal_batch_size]
-                    batch_ids = new_chunk_ids[i : i + optimal_batch_size]
-
-                    db.add_documents(batch_chunks, ids=batch_ids)
-                    pbar.update(len(batch_chunks))
-        else:
-            db.add_documents(new_chunks, ids=new_chunk_ids)
-
+                # Cached chunks are written while the first batches embed
+                for start in range(0, len(cached), max_upsert_size):
+                    rows = cached[start : start + max_upsert_size]
+                    upsert_chunks(
+                        db,
+                        [new_chunks[i] for i in rows],
+                        read_cached_embeddings(shards, shard_of[rows], row_of[rows]),
+                    )
+                    pbar.update(len(rows))
+                pending_chunks, pending_embeddings = [], []
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    pending_chunks.extend(batch)
+                    pending_embeddings.extend(future.result())
+                    pbar.update(len(batch))
+                    while len(pending_chunks) >= max_upsert_size:
+                        store_new_embeddings(
+                            db,
+                            embedding_function.model,
+                            pending_chunks[:max_upsert_size],
+                            pending_embeddings[:max_upsert_size],
+                        )
+                        del pending_chunks[:max_upsert_size]
+                        del pending_embeddings[:max_upsert_size]
+                if pending_chunks:
+                    store_new_embeddings(
+                        db, embedding_function.model, pending_chunks, pending_embeddings
+                    )
+
+        del shards
+        compact_embedding_cache(embedding_function.model)
         print("✅ Successfully added all new documents to database")
+        existing_ids = existing_ids | set(new_chunk_ids)
     else:
         print("✅ All documents are already in the database - nothing to add")
 
+    save_cached_ids(existing_ids)
+
+
+def load_cached_ids() -> Optional[Set[str]]:
+    """Load the chunk IDs recorded by the last ingest, if the cache exists"""
+    if not ID_CACHE_PATH.exists():
+        return None
+    try:
+        with open(ID_CACHE_PATH, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable ID cache: {e}")
+        return None
+
+
+def save_cached_ids(ids: Set[str]):
+    """Persist the ingested chunk IDs so the next run can skip a full DB scan"""
+    ID_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = ID_CACHE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(ids, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(ID_CACHE_PATH)
+
+
+def content_hash(text: str) -> int:
+    """64-bit hash of a chunk's text, the key of the embedding cache"""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def embedding_cache_dir(model_name: str) -> Path:
+    """Folder holding the embedding cache shards of one embedding model"""
+    return EMBEDDING_CACHE_PATH / "".join(c if c.isalnum() else "_" for c in model_name)
+
+
+def load_embedding_shards(model_name: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Open the cache shards of a model as (sorted hashes, memory-mapped vectors).
+
+    Only the hashes are read into memory; a vector row is read from disk
+    when it is used.
+    """
+    shards = []
+    cache_dir = embedding_cache_dir(model_name)
+    if not cache_dir.exists():
+        return shards
+    for hashes_path in sorted(cache_dir.glob("*.hashes.npy")):
+        shard = hashes_path.name[: -len(".hashes.npy")]
+        try:
+            shard_hashes = np.load(hashes_path)
+            shard_vectors = np.load(cache_dir / f"{shard}.vectors.npy", mmap_mode="r")
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable embedding cache shard {shard}: {e}")
+            continue
+        if len(shard_hashes) and len(shard_hashes) == len(shard_vectors):
+            shards.append((shard_hashes, shard_vectors))
+    return shards
+
+
+def lookup_cached_embeddings(
+    shards: List[Tuple[np.ndarray, np.ndarray]], hashes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Locate each hash in the cache as (shard index, row); the shard is -1 on a miss"""
+    shard_of = np.full(len(hashes), -1, dtype=np.int64)
+    row_of = np.zeros(len(hashes), dtype=np.int64)
+    for index, (shard_hashes, _) in enumerate(shards):
+        rows = np.minimum(np.searchsorted(shard_hashes, hashes), len(shard_hashes) - 1)
+        hit = (shard_of < 0) & (shard_hashes[rows] == hashes)
+        shard_of[hit] = index
+        row_of[hit] = rows[hit]
+    return shard_of, row_of
+
+
+def read_cached_embeddings(
+    shards: List[Tuple[np.ndarray, np.ndarray]],
+    shard_of: np.ndarray,
+    row_of: np.ndarray,
+) -> np.ndarray:
+    """Read the cached vectors at the given (shard index, row) locations"""
+    dimensions = shards[shard_of[0]][1].shape[1]
+    vectors = np.empty((len(shard_of), dimensions), dtype=np.float32)
+    for index in np.unique(shard_of):
+        selected = shard_of == index
+        vectors[selected] = shards[index][1][row_of[selected]]
+    return vectors
+
+
+def save_embedding_shard(model_name: str, hashes: np.ndarray, vectors: np.ndarray):
+    """Write newly computed embeddings to a new cache shard, sorted by hash.
+
+    Existing shards are never rewritten here, so each upsert only costs the
+    size of what it embedded.
+    """
+    order = np.argsort(hashes, kind="stable")
+    hashes = hashes[order]
+    keep = np.ones(len(hashes), dtype=bool)
+    keep[1:] = hashes[1:] != hashes[:-1]
+    write_embedding_shard(model_name, hashes[keep], vectors[order[keep]])
+
+
+def write_embedding_shard(model_name: str, hashes: np.ndarray, vectors: np.ndarray):
+    """Write a shard's vectors, then its hashes; a shard is visible once both exist"""
+    cache_dir = embedding_cache_dir(model_name)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    shard = str(time.time_ns())
+    for suffix, array in ((".vectors.npy", vectors), (".hashes.npy", hashes)):
+        path = cache_dir / f"{shard}{suffix}"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        tmp_path.replace(path)
+
+
+def compact_embedding_cache(model_name: str):
+    """Merge the smaller cache shards into one once there are too many.
+
+    Every lookup searches every shard, so the shard count is kept small.
+    The largest shard is left alone, and the merged vectors are copied in
+    blocks through a memory-mapped file, so memory stays bounded.
+    """
+    cache_dir = embedding_cache_dir(model_name)
+    shard_names = sorted(
+        path.name[: -len(".hashes.npy")] for path in cache_dir.glob("*.hashes.npy")
+    )
+    if len(shard_names) <= EMBEDDING_CACHE_MAX_SHARDS:
+        return
+    shards = []
+    for shard in shard_names:
+        try:
+            shard_hashes = np.load(cache_dir / f"{shard}.hashes.npy")
+            shard_vectors = np.load(cache_dir / f"{shard}.vectors.npy", mmap_mode="r")
+        except Exception:
+            continue
+        if len(shard_hashes) == len(shard_vectors):
+            shards.append((shard, shard_hashes, shard_vectors))
+    if len(shards) < 3:
+        return
+    shards.remove(max(shards, key=lambda shard: len(shard[1])))
+
+    hashes = np.concatenate([shard_hashes for _, shard_hashes, _ in shards])
+    shard_of = np.concatenate(
+        [np.full(len(h), i, dtype=np.int64) for i, (_, h, _) in enumerate(shards)]
+    )
+    row_of = np.concatenate([np.arange(len(h)) for _, h, _ in shards])
+    order = np.argsort(hashes, kind="stable")
+    hashes = hashes[order]
+    keep = np.ones(len(hashes), dtype=bool)
+    keep[1:] = hashes[1:] != hashes[:-1]
+    order = order[keep]
+    hashes = hashes[keep]
+
+    merged = str(time.time_ns())
+    vectors_path = cache_dir / f"{merged}.vectors.npy"
+    tmp_path = vectors_path.with_suffix(".tmp")
+    sources = [(h, v) for _, h, v in shards]
+    vectors = np.lib.format.open_memmap(
+        tmp_path,
+        mode="w+",
+        dtype=np.float32,
+        shape=(len(hashes), sources[0][1].shape[1]),
+    )
+    for start in range(0, len(order), EMBEDDING_CACHE_MERGE_BLOCK):
+        block = order[start : start + EMBEDDING_CACHE_MERGE_BLOCK]
+        vectors[start : start + len(block)] = read_cached_embeddings(
+            sources, shard_of[block], row_of[block]
+        )
+    vectors.flush()
+    del vectors
+    tmp_path.replace(vectors_path)
+    hashes_path = cache_dir / f"{merged}.hashes.npy"
+    tmp_path = hashes_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, hashes)
+    tmp_path.replace(hashes_path)
+
+    # Drop each hashes file before its vectors, so no shard is ever half there
+    for shard, _, _ in shards:
+        (cache_dir / f"{shard}.hashes.npy").unlink(missing_ok=True)
+        (cache_dir / f"{shard}.vectors.npy").unlink(missing_ok=True)
+    print(f"🗜️  Merged {len(shards)} embedding cache shards")
+
 
 def clear_database():
     """Clear the vector database"""
@@ -217,6 +642,9 @@ def print_system_info():
     print(f"   CPU Cores Available: {mp.cpu_count()}")
     print(f"   Max Workers: {MAX_WORKERS}")
     print(f"   Batch Size: {BATCH_SIZE}")
+    print(f"   Embedding Requests in Flight: {EMBED_WORKERS}")
+
+    print(f"   Rust Text Splitter: {'✅ Enabled' if USE_RUST_SPLITTER else '❌ Disabled'}")
 
     if HAS_TORCH:
         print(f"   PyTorch Available: ✅")
@@ -248,13 +676,12 @@ def main():
 
     # Create (or update) the data store with optimizations.
     print("🚀 Starting optimized document loading...")
-    documents = load_documents_parallel()
+    chunks = load_and_split_documents_parallel()
 
-    if not documents:
+    if not chunks:
         print("⚠️  No documents loaded. Exiting.")
         return
 
-    chunks = split_documents_optimized(documents)
     add_to_db_optimized(chunks)
 
     print("🎉 Document loading completed successfully!")
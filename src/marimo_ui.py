@@ -6,8 +6,13 @@ app = marimo.App()
 
 @app.cell
 def _():
+    import threading
+
     import marimo as mo
-    from rag_query import query_rag_with_sources
+    from rag_query import query_rag_with_sources, warm_up
+
+    # Load the embedding model in the background while the page renders
+    threading.Thread(target=warm_up, daemon=True).start()
     return mo, query_rag_with_sources
 
 
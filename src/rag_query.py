@@ -1,5 +1,6 @@
 import argparse
-import re
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from dynaconf import Dynaconf
@@ -16,6 +17,21 @@ settings = Dynaconf(
 
 CHROMA_PATH = settings.pdf_processing.chroma_path
 
+DEFAULT_PROMPT = """
+Answer the question based only on the following context:
+
+{context}
+
+---
+
+Answer the question based on the above context in a brief: {question}
+"""
+# Parsed once here rather than on every query
+PROMPT_TEMPLATE = ChatPromptTemplate.from_template(
+    settings.get('rag.prompt_template', DEFAULT_PROMPT)
+)
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
 
 def main():
     # Create CLI.
@@ -26,61 +42,85 @@ def main():
     query_rag(query_text)
 
 
-def remove_think_tags(response):
-    return re.sub(r"<think>.*?</think>", "", response, flags=re.DOTALL)
+@lru_cache(maxsize=1)
+def get_db(chroma_path: str = CHROMA_PATH) -> Chroma:
+    """Open the vector store once and reuse it across queries"""
+    return Chroma(persist_directory=chroma_path, embedding_function=get_embedding_function())
 
 
-def query_rag_with_sources(query: str):
-    """Enhanced RAG query that returns both response and detailed source information"""
+def warm_up():
+    """Load the embedding model into Ollama before the first question"""
+    try:
+        get_db().embeddings.embed_query("warmup")
+    except Exception:
+        # Nothing to do yet; the first real query reports the problem
+        pass
+
+
+def remove_think_tags(response):
+    """Strip <think>...</think> blocks; an unclosed <think> is left as is"""
+    parts = []
+    start = 0
+    while True:
+        open_at = response.find("<think>", start)
+        if open_at < 0:
+            parts.append(response[start:])
+            break
+        parts.append(response[start:open_at])
+        close_at = response.find("</think>", open_at)
+        if close_at < 0:
+            parts.append(response[open_at:])
+            break
+        start = close_at + len("</think>")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_llm(model_name: str) -> OllamaLLM:
+    """Build the Ollama chat model once and reuse it across queries"""
+    return OllamaLLM(model=model_name)
+
+
+def stream_rag_with_sources(query: str):
+    """Retrieve context for the query and stream the answer.
+
+    Returns a (token iterator, sources) pair: the search runs right away so
+    the sources are ready, while tokens are generated as they are consumed.
+    """
     # Prepare the DB.
-    embedding_function = get_embedding_function()
-    db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
+    db = get_db()
 
     # Search the DB.
     search_count = settings.get('rag.search_count', 5)
     results = db.similarity_search_with_score(query, k=search_count)
 
-    context = "\n\n---\n\n".join([doc.page_content for doc, _score in results])
-    prompt_template_text = settings.get('rag.prompt_template', """
-Answer the question based only on the following context:
-
-{context}
-
----
-
-Answer the question based on the above context in a brief: {question}
-""")
-    prompt_template = ChatPromptTemplate.from_template(prompt_template_text)
-    prompt = prompt_template.format(context=context, question=query)
+    context = CONTEXT_SEPARATOR.join([doc.page_content for doc, _score in results])
+    prompt = PROMPT_TEMPLATE.format(context=context, question=query)
 
     # model = OllamaLLM(model="mistral")
     model_name = settings.get('rag.model', 'gemma3n:latest')
-    model = OllamaLLM(model=model_name)
+    model = get_llm(model_name)
     # model = OllamaLLM(model="gemma3n:e4b")
     # model = OllamaLLM(model="llama3")
-    response_text = model.invoke(prompt)
-    response = remove_think_tags(response_text)
+    tokens = model.stream(prompt)
 
     # Extract detailed source information
     sources = []
     for i, (doc, score) in enumerate(results, 1):
         source_id = doc.metadata.get("id", "Unknown")
+        page_content = doc.page_content
         
-        # Parse source ID: "data/renamed_pdfs/filename.pdf:page:chunk"
-        pdf_file = "Unknown"
-        page_num = "Unknown"
-        chunk_num = "Unknown"
-        
-        if source_id and ":" in source_id:
-            parts = source_id.split(":")
-            if len(parts) >= 3:
-                pdf_path = parts[0]
-                pdf_file = Path(pdf_path).name if pdf_path != "Unknown" else "Unknown"
-                page_num = parts[1]
-                chunk_num = parts[2]
+        # Parse source ID: "data/renamed_pdfs/filename.pdf:page:chunk".
+        # rsplit keeps any ":" inside the path itself with the path
+        parts = source_id.rsplit(":", 2) if source_id else ()
+        if len(parts) == 3:
+            pdf_path, page_num, chunk_num = parts
+            pdf_file = os.path.basename(pdf_path)
+        else:
+            pdf_file = page_num = chunk_num = "Unknown"
         
         # Get excerpt (first 150 characters)
-        excerpt = doc.page_content[:150] + "..." if len(doc.page_content) > 150 else doc.page_content
+        excerpt = f"{page_content[:150]}..." if len(page_content) > 150 else page_content
         
         sources.append({
             "citation_number": i,
@@ -92,6 +132,14 @@ Answer the question based on the above context in a brief: {question}
             "full_id": source_id
         })
     
+    return tokens, sources
+
+
+def query_rag_with_sources(query: str):
+    """Enhanced RAG query that returns both response and detailed source information"""
+    tokens, sources = stream_rag_with_sources(query)
+    response = remove_think_tags("".join(tokens))
+
     return {
         "response": response,
         "sources": sources